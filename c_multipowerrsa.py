@@ -41,9 +41,9 @@ class MultiPowerRSA:
         Args:
             message: The message to encrypt (int, bytes, or string)
             public_key (bytes, optional): The public key to use for encryption
-            
+
         Returns:
-            str: The encrypted message as a string representation of a large integer
+            bytes: The encrypted message as big-endian bytes
         """
         return self._rsa.encrypt(message, public_key or self.public_key)
         
@@ -52,9 +52,9 @@ class MultiPowerRSA:
         Decrypt a message using Multi-Power RSA.
         
         Args:
-            ciphertext: The encrypted message (string or int)
+            ciphertext: The encrypted message (bytes, string or int)
             private_key (bytes, optional): The private key to use for decryption
-            
+
         Returns:
             int: The decrypted message as an integer
         """
@@ -65,9 +65,9 @@ class MultiPowerRSA:
         Decrypt a message and return it as bytes.
         
         Args:
-            ciphertext: The encrypted message (string or int)
+            ciphertext: The encrypted message (bytes, string or int)
             private_key (bytes, optional): The private key to use for decryption
-            
+
         Returns:
             bytes: The decrypted message as bytes
         """
@@ -84,6 +84,8 @@ class MultiPowerRSA:
         Returns:
             int: Integer representation of the bytes
         """
+        # int.from_bytes/to_bytes run in C inside CPython; routing these
+        # through the extension would only add a boundary crossing
         return int.from_bytes(data, byteorder='big')
     
     @staticmethod
@@ -30,7 +30,7 @@ def test_twofish():
     
     # Multi-block encryption with CBC mode
     iv = os.urandom(16)  # Generate random IV
-    encrypted_cbc = cipher.encrypt(long_text, mode='cbc', iv=iv)
+    encrypted_cbc = cipher.encrypt(long_text, mode='cbc', iv=iv)  # bare ciphertext
     decrypted_cbc = cipher.decrypt(encrypted_cbc, mode='cbc', iv=iv)
     
     print("=== CBC Mode Test ===")
@@ -6,14 +6,44 @@ import os
 import secrets
 import base64
 import json
+import logging
+import struct
 from .c_multipowerrsa import MultiPowerRSA
 
+logger = logging.getLogger(__name__)
+
+# Fields every encrypted envelope must carry
+_REQUIRED_FIELDS = frozenset({"algorithm", "ciphertext", "iv", "encrypted_key"})
+
+def _field_bytes(value):
+    """Accept either raw bytes or the base64 text used by the JSON envelope"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return base64.b64decode(value)
+
 class HybridCryptosystem:
     def __init__(self):
         """Initialize the hybrid cryptosystem"""
         self.twofish = None
         self.rsa = None
-        
+        self._cipher_cache = {}
+
+    _CIPHER_CACHE_SIZE = 8
+
+    def _get_cipher(self, key):
+        """Return a Twofish cipher for key, reusing cached key schedules"""
+        # Import pangfish here to avoid circular imports
+        from pangfish import Twofish
+
+        cipher = self._cipher_cache.get(key)
+        if cipher is None:
+            if len(self._cipher_cache) >= self._CIPHER_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del self._cipher_cache[next(iter(self._cipher_cache))]
+            cipher = self._cipher_cache[key] = Twofish(key)
+        return cipher
+
+
     def generate_keys(self, rsa_key_size=2048, b=3):
         """
         Generate RSA key pair for the hybrid cryptosystem
@@ -40,29 +70,29 @@ class HybridCryptosystem:
         Returns:
             dict: Dictionary containing the encrypted data and metadata
         """
-        # Import pangfish here to avoid circular imports
-        from pangfish import Twofish
-        
         if twofish_key is None:
             twofish_key = secrets.token_bytes(32)  # 256-bit key
-        
-        # Print debug information
-        print(f"Original plaintext length: {len(plaintext)}")
-        
-        # Create Twofish cipher and encrypt the plaintext
-        cipher = Twofish(twofish_key)
-        ciphertext = cipher.encrypt(plaintext, mode='cbc', iv=os.urandom(16))
-        
-        print(f"Encrypted ciphertext length: {len(ciphertext)}")
+
+        # Deferred %-formatting: no interpolation unless DEBUG is on
+        logger.debug("Original plaintext length: %d", len(plaintext))
+
+        # Create Twofish cipher and encrypt the plaintext; generating the
+        # IV here means the cipher returns the bare ciphertext and
+        # nothing needs to be sliced back apart below
+        iv = os.urandom(16)
+        cipher = self._get_cipher(twofish_key)
+        ciphertext = cipher.encrypt(plaintext, mode='cbc', iv=iv)
+
+        logger.debug("Encrypted ciphertext length: %d", len(ciphertext))
         
         # If public key is not provided, use the one from the object
         if public_key is None:
             if self.rsa is None or self.rsa.public_key is None:
                 raise ValueError("No public key available. Generate or provide keys first.")
             public_key = self.rsa.public_key
-        
-        # Initialize RSA if not already done
-        if self.rsa is None:
+        elif self.rsa is None:
+            # Explicit key on a fresh instance: create an RSA context to
+            # carry out the operation
             self.rsa = MultiPowerRSA()
         
         # Encrypt the Twofish key with RSA
@@ -70,15 +100,11 @@ class HybridCryptosystem:
         encrypted_key = self.rsa.encrypt(key_int, public_key)
         
         # Prepare the output format
-        # Extract iv from the beginning of ciphertext (first 16 bytes for CBC mode)
-        iv = ciphertext[:16]
-        actual_ciphertext = ciphertext[16:]
-        
         result = {
             "algorithm": "Twofish-MultiPowerRSA",
-            "ciphertext": base64.b64encode(actual_ciphertext).decode('utf-8'),
+            "ciphertext": base64.b64encode(ciphertext).decode('utf-8'),
             "iv": base64.b64encode(iv).decode('utf-8'),
-            "encrypted_key": encrypted_key
+            "encrypted_key": base64.b64encode(encrypted_key).decode('utf-8')
         }
         
         return result
@@ -94,34 +120,30 @@ class HybridCryptosystem:
         Returns:
             bytes: Decrypted plaintext
         """
-        # Import pangfish here to avoid circular imports
-        from pangfish import Twofish
-        
         # Validate input format
-        required_fields = ["algorithm", "ciphertext", "iv", "encrypted_key"]
-        if not all(field in encrypted_data for field in required_fields):
+        if not _REQUIRED_FIELDS <= encrypted_data.keys():
             raise ValueError("Invalid encrypted data format")
         
         # Check algorithm
         if encrypted_data["algorithm"] != "Twofish-MultiPowerRSA":
             raise ValueError(f"Unsupported algorithm: {encrypted_data['algorithm']}")
         
-        # Extract components
-        ciphertext = base64.b64decode(encrypted_data["ciphertext"])
-        iv = base64.b64decode(encrypted_data["iv"])
-        encrypted_key = encrypted_data["encrypted_key"]
+        # Extract components; binary frames carry raw bytes, JSON carries base64
+        ciphertext = _field_bytes(encrypted_data["ciphertext"])
+        iv = _field_bytes(encrypted_data["iv"])
+        encrypted_key = _field_bytes(encrypted_data["encrypted_key"])
         
-        print(f"Encrypted ciphertext length: {len(ciphertext)}")
-        print(f"IV length: {len(iv)}")
+        logger.debug("Encrypted ciphertext length: %d", len(ciphertext))
+        logger.debug("IV length: %d", len(iv))
         
         # If private key is not provided, use the one from the object
         if private_key is None:
             if self.rsa is None or self.rsa.private_key is None:
                 raise ValueError("No private key available. Generate or provide keys first.")
             private_key = self.rsa.private_key
-        
-        # Initialize RSA if not already done
-        if self.rsa is None:
+        elif self.rsa is None:
+            # Explicit key on a fresh instance: create an RSA context to
+            # carry out the operation
             self.rsa = MultiPowerRSA()
         
         # Decrypt the Twofish key
@@ -129,22 +151,74 @@ class HybridCryptosystem:
         twofish_key = MultiPowerRSA.int_to_bytes(key_int)
         
         # Create Twofish cipher and decrypt the ciphertext
-        cipher = Twofish(twofish_key)
-        
-        # Reconstruct the full ciphertext with IV
-        full_ciphertext = iv + ciphertext
-        
-        # Decrypt the message
-        plaintext = cipher.decrypt(full_ciphertext, mode='cbc', iv=iv)
+        cipher = self._get_cipher(twofish_key)
+
+        # Decrypt the message; passing the IV explicitly avoids
+        # reassembling (and then re-splitting) an IV-prefixed buffer
+        plaintext = cipher.decrypt(ciphertext, mode='cbc', iv=iv)
         
         return plaintext
     
+    # Binary frames start with a zero byte, which no JSON document does
+    _BINARY_MAGIC = b"\x00"
+
     @staticmethod
-    def serialize_encrypted_data(encrypted_data):
-        """Convert encrypted data dictionary to JSON string"""
-        return json.dumps(encrypted_data)
-    
+    def serialize_binary(encrypted_data):
+        """Pack encrypted data into a length-prefixed binary frame"""
+        algorithm = encrypted_data["algorithm"].encode('utf-8')
+        iv = _field_bytes(encrypted_data["iv"])
+        encrypted_key = _field_bytes(encrypted_data["encrypted_key"])
+        ciphertext = _field_bytes(encrypted_data["ciphertext"])
+        return b"".join((
+            HybridCryptosystem._BINARY_MAGIC,
+            struct.pack('>B', len(algorithm)), algorithm,
+            iv,
+            struct.pack('>I', len(encrypted_key)), encrypted_key,
+            struct.pack('>Q', len(ciphertext)), ciphertext,
+        ))
+
+    @staticmethod
+    def deserialize_binary(data):
+        """Unpack a binary frame produced by serialize_binary"""
+        if data[:1] != HybridCryptosystem._BINARY_MAGIC:
+            raise ValueError("Not a binary encrypted data frame")
+        offset = 1
+        (alg_len,) = struct.unpack_from('>B', data, offset)
+        offset += 1
+        algorithm = bytes(data[offset:offset + alg_len]).decode('utf-8')
+        offset += alg_len
+        iv = bytes(data[offset:offset + 16])
+        offset += 16
+        (key_len,) = struct.unpack_from('>I', data, offset)
+        offset += 4
+        encrypted_key = bytes(data[offset:offset + key_len])
+        offset += key_len
+        (ct_len,) = struct.unpack_from('>Q', data, offset)
+        offset += 8
+        ciphertext = bytes(data[offset:offset + ct_len])
+        if len(ciphertext) != ct_len:
+            raise ValueError("Truncated encrypted data frame")
+        return {
+            "algorithm": algorithm,
+            "ciphertext": ciphertext,
+            "iv": iv,
+            "encrypted_key": encrypted_key
+        }
+
+    @staticmethod
+    def serialize_encrypted_data(encrypted_data, binary=True):
+        """Serialize encrypted data; binary framing by default, JSON on request"""
+        if binary:
+            # Raw bytes with length prefixes: no base64 passes and none
+            # of base64's 33% size overhead on the ciphertext
+            return HybridCryptosystem.serialize_binary(encrypted_data)
+        # Compact separators: the payload fields are base64 blobs, so the
+        # default ', '/': ' whitespace is pure size and copy overhead
+        return json.dumps(encrypted_data, separators=(',', ':'))
+
     @staticmethod
-    def deserialize_encrypted_data(json_data):
-        """Convert JSON string to encrypted data dictionary"""
-        return json.loads(json_data)
\ No newline at end of file
+    def deserialize_encrypted_data(data):
+        """Convert serialized encrypted data (binary frame or JSON) to a dictionary"""
+        if isinstance(data, (bytes, bytearray)) and data[:1] == HybridCryptosystem._BINARY_MAGIC:
+            return HybridCryptosystem.deserialize_binary(data)
+        return json.loads(data)
\ No newline at end of file
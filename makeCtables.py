@@ -1,47 +1,73 @@
-import myref
-
-print('#define u8 unsigned char')
-print('u8 RS[4][8] = {')
-for i in myref.RS:
-    print('    {', end=' ')
-    for j in i:
-        print("0x%02X," % j, end=' ')
-    print('},')
-print('};')
-print()
-
-print('u8 Q0[] = {')
-print('   ', end='')
-for i in range(256):
-    print("0x%02X," % myref.Qpermute(i, myref.Q0), end=' ')
-    if not ((i+1) % 8):
-        print('\n   ', end='')
-print('};')
-print()
-
-print('u8 Q1[] = {')
-print('   ', end='')
-for i in range(256):
-    print("0x%02X," % myref.Qpermute(i, myref.Q1), end=' ')
-    if not ((i+1) % 8):
-        print('\n   ', end='')
-print('};')
-print()
-
-print('u8 mult5B[] = {')
-print('   ', end='')
-for i in range(256):
-    print("0x%02X," % myref.gfMult(0x5B, i, myref.GF_MOD), end=' ')
-    if not ((i+1) % 8):
-        print('\n   ', end='')
-print('};')
-print()
-
-print('u8 multEF[] = {')
-print('   ', end='')
-for i in range(256):
-    print("0x%02X," % myref.gfMult(0xEF, i, myref.GF_MOD), end=' ')
-    if not ((i+1) % 8):
-        print('\n   ', end='')
-print('};')
-print()
\ No newline at end of file
+import myref
+
+# Build each table once up front instead of re-running the permutation /
+# GF multiply per printed entry.
+q0 = [myref.Qpermute(i, myref.Q0) for i in range(256)]
+q1 = [myref.Qpermute(i, myref.Q1) for i in range(256)]
+mult5B = [myref.gfMult(0x5B, i, myref.GF_MOD) for i in range(256)]
+multEF = [myref.gfMult(0xEF, i, myref.GF_MOD) for i in range(256)]
+
+print('#define u8 unsigned char')
+print('u8 RS[4][8] = {')
+for r in range(4):
+    print('    {', end=' ')
+    for j in myref.RS[r*8:(r+1)*8]:
+        print("0x%02X," % j, end=' ')
+    print('},')
+print('};')
+print()
+
+print('u8 Q0[] = {')
+print('   ', end='')
+for i in range(256):
+    print("0x%02X," % q0[i], end=' ')
+    if not ((i+1) % 8):
+        print('\n   ', end='')
+print('};')
+print()
+
+print('u8 Q1[] = {')
+print('   ', end='')
+for i in range(256):
+    print("0x%02X," % q1[i], end=' ')
+    if not ((i+1) % 8):
+        print('\n   ', end='')
+print('};')
+print()
+
+# Raw 4x16 nibble tables, used by the SSSE3 pshufb Qpermute path
+print('u8 Q0t[4][16] = {')
+for r in range(4):
+    print('    {', end=' ')
+    for j in myref.Q0[r*16:(r+1)*16]:
+        print("0x%02X," % j, end=' ')
+    print('},')
+print('};')
+print()
+
+print('u8 Q1t[4][16] = {')
+for r in range(4):
+    print('    {', end=' ')
+    for j in myref.Q1[r*16:(r+1)*16]:
+        print("0x%02X," % j, end=' ')
+    print('},')
+print('};')
+print()
+
+print('u8 mult5B[] = {')
+print('   ', end='')
+for i in range(256):
+    print("0x%02X," % mult5B[i], end=' ')
+    if not ((i+1) % 8):
+        print('\n   ', end='')
+print('};')
+print()
+
+print('u8 multEF[] = {')
+print('   ', end='')
+for i in range(256):
+    print("0x%02X," % multEF[i], end=' ')
+    if not ((i+1) % 8):
+        print('\n   ', end='')
+print('};')
+print()
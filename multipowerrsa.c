@@ -19,6 +19,13 @@ void mp_rsa_init(mp_rsa_ctx *ctx, unsigned int key_size, unsigned int b) {
     mpz_init(ctx->r2);
     mpz_init(ctx->phi_n);
     mpz_init(ctx->p_power);
+    mpz_init(ctx->p_power_inv);
+
+    /* Size the decrypt temporaries up front so GMP never has to grow
+       them mid-operation; intermediates stay below 2 * key_size bits */
+    for (unsigned int i = 0; i < MP_RSA_SCRATCH_COUNT; i++) {
+        mpz_init2(ctx->scratch[i], (mp_bitcnt_t)key_size * 2);
+    }
 }
 
 /* Free all memory used by a Multi-Power RSA context */
@@ -32,6 +39,11 @@ void mp_rsa_clear(mp_rsa_ctx *ctx) {
     mpz_clear(ctx->r2);
     mpz_clear(ctx->phi_n);
     mpz_clear(ctx->p_power);
+    mpz_clear(ctx->p_power_inv);
+
+    for (unsigned int i = 0; i < MP_RSA_SCRATCH_COUNT; i++) {
+        mpz_clear(ctx->scratch[i]);
+    }
 }
 
 /* Generate a random prime number of specified bit length */
@@ -105,6 +117,9 @@ int mp_rsa_generate_keys(mp_rsa_ctx *ctx) {
     /* Calculate CRT components */
     mpz_mod(ctx->r1, ctx->d, p_minus_1);
     mpz_mod(ctx->r2, ctx->d, q_minus_1);
+
+    /* Garner coefficient for recombination, computed once per key */
+    mpz_invert(ctx->p_power_inv, ctx->p_power, ctx->q);
     
     /* Clean up */
     mpz_clear(p_minus_1);
@@ -123,7 +138,9 @@ int mp_rsa_encrypt(mp_rsa_ctx *ctx, const mpz_t message, mpz_t cipher) {
         return -1; /* Message too large */
     }
     
-    /* c = m^e mod n */
+    /* c = m^e mod n; mpz_powm (like mpz_powm_sec on the private side)
+       is a windowed exponentiation inside GMP, so no hand-written
+       square-and-multiply loop belongs in this file */
     mpz_powm(cipher, message, ctx->e, ctx->n);
     
     return 0;
@@ -131,105 +148,84 @@ int mp_rsa_encrypt(mp_rsa_ctx *ctx, const mpz_t message, mpz_t cipher) {
 
 /* Decrypt a message using Multi-Power RSA with CRT optimization */
 int mp_rsa_decrypt(mp_rsa_ctx *ctx, const mpz_t cipher, mpz_t message) {
-    mpz_t m1, m2, m_prime1, error, correction, inverse, p_power_i, temp;
-    int result = 0;
-    
-    mpz_init(m1);
-    mpz_init(m2);
-    mpz_init(m_prime1);
-    mpz_init(error);
-    mpz_init(correction);
-    mpz_init(inverse);
-    mpz_init(p_power_i);
-    mpz_init(temp);
-    
+    /* Temporaries come from the pool preallocated in mp_rsa_init, so a
+       decryption performs no mpz_init/mpz_clear (and hence no heap
+       traffic for the temporaries) at all */
+    mpz_ptr m1 = ctx->scratch[0];
+    mpz_ptr m2 = ctx->scratch[1];
+    mpz_ptr m_prime1 = ctx->scratch[2];
+    mpz_ptr error = ctx->scratch[3];
+    mpz_ptr correction = ctx->scratch[4];
+    mpz_ptr inverse = ctx->scratch[5];
+    mpz_ptr p_power_i = ctx->scratch[6];
+    mpz_ptr p_power_next = ctx->scratch[7];
+    mpz_ptr temp = ctx->scratch[8];
+
     /* Check if cipher is valid */
     if (mpz_cmp(cipher, ctx->n) >= 0) {
-        result = -1;
-        goto cleanup;
+        return -1;
     }
     
-    /* Compute m1 = c^r1 mod p */
-    mpz_powm(m1, cipher, ctx->r1, ctx->p);
-    
-    /* Compute m2 = c^r2 mod q */
-    mpz_powm(m2, cipher, ctx->r2, ctx->q);
+    /* Compute m1 = c^r1 mod p and m2 = c^r2 mod q. These are the two
+       secret-exponent exponentiations, so use the constant-time
+       mpz_powm_sec (p and q are odd, as it requires); the lifting
+       powms below use only the public exponent e */
+    mpz_powm_sec(m1, cipher, ctx->r1, ctx->p);
+    mpz_powm_sec(m2, cipher, ctx->r2, ctx->q);
     
     /* Perform Hensel lifting to find M'1 */
     if (ctx->b > 2) {
         /* Start with initial solution modulo p */
         mpz_set(m_prime1, m1);
-        
+
+        /* Track p^i and p^(i+1) incrementally instead of calling
+           mpz_pow_ui from scratch on every iteration */
+        mpz_set(p_power_i, ctx->p);
+        mpz_mul(p_power_next, ctx->p, ctx->p);
+
+        /* Invert the derivative e * m1^(e-1) mod p once up front: every
+           lift leaves m_prime1 congruent to m1 mod p, so the inverse is
+           the same on all iterations */
+        mpz_sub_ui(temp, ctx->e, 1);
+        mpz_powm(temp, m1, temp, ctx->p);
+        mpz_mul(temp, temp, ctx->e);
+        mpz_mod(temp, temp, ctx->p);
+        mpz_invert(inverse, temp, ctx->p);
+
         /* Iteratively lift solution to higher powers of p */
         for (unsigned int i = 1; i < ctx->b - 1; i++) {
-            mpz_pow_ui(p_power_i, ctx->p, i + 1);
-            
             /* Compute error in current approximation */
-            mpz_powm(error, m_prime1, ctx->e, p_power_i);
+            mpz_powm(error, m_prime1, ctx->e, p_power_next);
             mpz_sub(error, error, cipher);
-            mpz_mod(error, error, p_power_i);
-            
+            mpz_mod(error, error, p_power_next);
+
             /* Compute correction factor */
-            mpz_pow_ui(temp, ctx->p, i);
-            mpz_fdiv_q(correction, error, temp);
-            
-            /* Compute inverse of e * m_prime1^(e-1) mod p */
-            mpz_sub_ui(temp, ctx->e, 1);
-            mpz_powm(temp, m_prime1, temp, ctx->p);
-            mpz_mul(temp, temp, ctx->e);
-            mpz_mod(temp, temp, ctx->p);
-            mpz_invert(inverse, temp, ctx->p);
-            
-            /* Adjust m_prime1 */
-            mpz_mul(temp, correction, inverse);
-            mpz_mod(temp, temp, ctx->p);
-            mpz_mul(temp, temp, p_power_i);
-            mpz_sub(m_prime1, m_prime1, temp);
-            mpz_mod(m_prime1, m_prime1, p_power_i);
+            mpz_fdiv_q(correction, error, p_power_i);
+
+            /* Adjust m_prime1: subtract (correction * inverse mod p) * p^i */
+            mpz_mul(correction, correction, inverse);
+            mpz_mod(correction, correction, ctx->p);
+            mpz_mul(correction, correction, p_power_i);
+            mpz_sub(m_prime1, m_prime1, correction);
+            mpz_mod(m_prime1, m_prime1, p_power_next);
+
+            /* Advance the running powers for the next lift */
+            mpz_set(p_power_i, p_power_next);
+            mpz_mul(p_power_next, p_power_next, ctx->p);
         }
     } else {
         mpz_set(m_prime1, m1);
     }
     
-    /* Apply Chinese Remainder Theorem */
-    mpz_t q_inv, p_power_inv, term1, term2;
-    mpz_init(q_inv);
-    mpz_init(p_power_inv);
-    mpz_init(term1);
-    mpz_init(term2);
-    
-    /* Compute CRT coefficients */
-    mpz_invert(q_inv, ctx->q, ctx->p_power);
-    mpz_invert(p_power_inv, ctx->p_power, ctx->q);
-    
-    /* Apply CRT formula */
-    mpz_mul(term1, m_prime1, ctx->q);
-    mpz_mul(term1, term1, q_inv);
-    mpz_mod(term1, term1, ctx->n);
-    
-    mpz_mul(term2, m2, ctx->p_power);
-    mpz_mul(term2, term2, p_power_inv);
-    mpz_mod(term2, term2, ctx->n);
-    
-    mpz_add(message, term1, term2);
-    mpz_mod(message, message, ctx->n);
-    
-    mpz_clear(q_inv);
-    mpz_clear(p_power_inv);
-    mpz_clear(term1);
-    mpz_clear(term2);
-    
-cleanup:
-    mpz_clear(m1);
-    mpz_clear(m2);
-    mpz_clear(m_prime1);
-    mpz_clear(error);
-    mpz_clear(correction);
-    mpz_clear(inverse);
-    mpz_clear(p_power_i);
-    mpz_clear(temp);
-    
-    return result;
+    /* Recombine with Garner's formula using the precomputed coefficient:
+       m = m'1 + p^(b-1) * ((m2 - m'1) * (p^(b-1))^-1 mod q) */
+    mpz_sub(temp, m2, m_prime1);
+    mpz_mul(temp, temp, ctx->p_power_inv);
+    mpz_mod(temp, temp, ctx->q);
+    mpz_mul(temp, temp, ctx->p_power);
+    mpz_add(message, m_prime1, temp);
+
+    return 0;
 }
 
 /* Export public key to memory */
@@ -381,7 +377,10 @@ int mp_rsa_import_private_key(mp_rsa_ctx *ctx, const unsigned char *key, size_t
     
     // Calculate n = p^(b-1) * q
     mpz_mul(ctx->n, ctx->p_power, ctx->q);
-    
+
+    // Garner coefficient for CRT recombination
+    mpz_invert(ctx->p_power_inv, ctx->p_power, ctx->q);
+
     free(key_copy);
     return 0;
 }
\ No newline at end of file
@@ -4,6 +4,9 @@
 #include <stddef.h>
 #include <gmp.h>
 
+/* Number of mpz_t temporaries pooled in the context for decryption */
+#define MP_RSA_SCRATCH_COUNT 9
+
 /* Multi-Power RSA context */
 typedef struct {
     mpz_t p;          /* Prime p */
@@ -15,6 +18,8 @@ typedef struct {
     mpz_t r2;         /* CRT exponent 2 */
     mpz_t phi_n;      /* Euler's totient function of n */
     mpz_t p_power;    /* p^(b-1) */
+    mpz_t p_power_inv; /* p^(b-1) inverse mod q (Garner CRT coefficient) */
+    mpz_t scratch[MP_RSA_SCRATCH_COUNT]; /* Preallocated decrypt temporaries */
     unsigned int key_size;  /* Key size in bits */
     unsigned int b;   /* Power parameter */
 } mp_rsa_ctx;
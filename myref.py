@@ -1,249 +1,300 @@
-import struct
-
-# GF modulus polynomials
-GF_MOD = 2**8 + 2**6 + 2**5 + 2**3 + 1
-RS_MOD = 2**8 + 2**6 + 2**3 + 2**2 + 1
-ROUNDS = 16
-
-def to32Char(X):
-    return list(struct.unpack('>BBBB', struct.pack('>I', X)))
-
-def bytesTo32Bits(l):
-    t = 0
-    for i in l:
-        t = t << 8
-        t = t + i
-    return t
-
-def ROR(x, n):
-    mask = (2**n) - 1
-    mask_bits = x & mask
-    return (x >> n) | (mask_bits << (32 - n))
-
-def ROL(x, n):
-    return ROR(x, 32 - n)
-
-def ROR4(x, n):
-    mask = (2**n) - 1
-    mask_bits = x & mask
-    return (x >> n) | (mask_bits << (4 - n))
-
-def polyMult(a, b):
-    t = 0
-    while a:
-        if a & 1:
-            t = t ^ b
-        b = b << 1
-        a = a >> 1
-    return t
-
-def gfMod(t, modulus):
-    modulus = modulus << 7
-    for i in range(8):
-        tt = t ^ modulus
-        if tt < t:
-            t = tt
-        modulus = modulus >> 1
-    return t
-
-def gfMult(a, b, modulus):
-    return gfMod(polyMult(a, b), modulus)
-
-def matrixMultiply(md, sd, modulus):
-    r = []
-    for j in range(len(md)):
-        t = 0
-        for k in range(len(sd)):
-            t = t ^ gfMult(md[j][k], sd[k], modulus)
-        r.insert(0, t)
-    return r
-
-# Constants
-MDS = [
-    [0x01, 0xEF, 0x5B, 0x5B],
-    [0x5B, 0xEF, 0xEF, 0x01],
-    [0xEF, 0x5B, 0x01, 0xEF],
-    [0xEF, 0x01, 0xEF, 0x5B],
-]
-
-RS = [
-    [0x01, 0xA4, 0x55, 0x87, 0x5A, 0x58, 0xDB, 0x9E],
-    [0xA4, 0x56, 0x82, 0xF3, 0x1E, 0xC6, 0x68, 0xE5],
-    [0x02, 0xA1, 0xFC, 0xC1, 0x47, 0xAE, 0x3D, 0x19],
-    [0xA4, 0x55, 0x87, 0x5A, 0x58, 0xDB, 0x9E, 0x03],
-]
-
-Q0 = [
-    [0x8, 0x1, 0x7, 0xD, 0x6, 0xF, 0x3, 0x2, 0x0, 0xB, 0x5, 0x9, 0xE, 0xC, 0xA, 0x4],
-    [0xE, 0xC, 0xB, 0x8, 0x1, 0x2, 0x3, 0x5, 0xF, 0x4, 0xA, 0x6, 0x7, 0x0, 0x9, 0xD],
-    [0xB, 0xA, 0x5, 0xE, 0x6, 0xD, 0x9, 0x0, 0xC, 0x8, 0xF, 0x3, 0x2, 0x4, 0x7, 0x1],
-    [0xD, 0x7, 0xF, 0x4, 0x1, 0x2, 0x6, 0xE, 0x9, 0xB, 0x3, 0x0, 0x8, 0x5, 0xC, 0xA],
-]
-
-Q1 = [
-    [0x2, 0x8, 0xB, 0xD, 0xF, 0x7, 0x6, 0xE, 0x3, 0x1, 0x9, 0x4, 0x0, 0xA, 0xC, 0x5],
-    [0x1, 0xE, 0x2, 0xB, 0x4, 0xC, 0x3, 0x7, 0x6, 0xD, 0xA, 0x5, 0xF, 0x9, 0x0, 0x8],
-    [0x4, 0xC, 0x7, 0x5, 0x1, 0x6, 0x9, 0xA, 0x0, 0xE, 0xD, 0x8, 0x2, 0xB, 0x3, 0xF],
-    [0xB, 0x9, 0x5, 0x1, 0xC, 0x3, 0xD, 0xE, 0x6, 0x4, 0x7, 0xF, 0x2, 0x0, 0x8, 0xA],
-]
-
-def printRoundKeys(K):
-    for i in range(0, len(K), 2):
-        print(f'{hex(K[i])[2:]:>8} {hex(K[i+1])[2:]:>8}')
-
-def keySched(M, N):
-    k = (N + 63) // 64
-    Me = [M[x] for x in range(0, (2*k-1), 2)]
-    Mo = [M[x] for x in range(1, (2*k), 2)]
-    
-    S = []
-    for i in range(0, k):
-        x1 = to32Char(Me[i])
-        x2 = to32Char(Mo[i])
-        vector = x1 + x2
-        prod = matrixMultiply(RS, vector, RS_MOD)
-        prod.reverse()
-        S.insert(0, bytesTo32Bits(prod))
-    
-    K = makeKey(Me, Mo, k)
-    return K, k, S
-
-def makeKey(Me, Mo, k):
-    K = []
-    rho = 0x01010101
-    for i in range(ROUNDS + 4):
-        A = h(2*i*rho, Me, k)
-        B = h((2*i+1)*rho, Mo, k)
-        B = ROL(B, 8)
-        K.append((A+B) & 0xFFFFFFFF)
-        K.append(ROL((A + 2*B) & 0xFFFFFFFF, 9))
-    return K
-
-def Qpermute(x, Q):
-    x = int(x)
-    a0, b0 = x//16, x % 16
-    a1 = a0 ^ b0
-    b1 = (a0 ^ ROR4(b0, 1) ^ (8*a0)) % 16
-    a2, b2 = Q[0][a1], Q[1][b1]
-    a3 = a2 ^ b2
-    b3 = (a2 ^ ROR4(b2, 1) ^ (8*a2)) % 16
-    a4, b4 = Q[2][a3], Q[3][b3]
-    return (16 * b4) + a4
-
-def h(X, L, k):
-    x = to32Char(X)
-    x.reverse()
-    l = [to32Char(Li) for Li in L]
-    y = x[:]
-
-    Qdones = [
-        [Q1, Q0, Q1, Q0],
-        [Q0, Q0, Q1, Q1],
-        [Q0, Q1, Q0, Q1],
-        [Q1, Q1, Q0, Q0],
-        [Q1, Q0, Q0, Q1],
-    ]
-
-    for i in range(k-1, -1, -1):
-        for j in range(4):
-            y[j] = Qpermute(y[j], Qdones[i+1][j]) ^ l[i][j]
-            
-    for j in range(4):
-        y[j] = Qpermute(y[j], Qdones[0][j])
-
-    z = matrixMultiply(MDS, y, GF_MOD)
-    return bytesTo32Bits(z)
-
-def g(X, S, k):
-    return h(X, S, k)
-
-def F(R0, R1, r, K, k, S):
-    T0 = g(R0, S, k)
-    T1 = g(ROL(R1, 8), S, k)
-    F0 = (T0 + T1 + K[2*r+8]) & 0xFFFFFFFF
-    F1 = (T0 + 2*T1 + K[2*r+9]) & 0xFFFFFFFF
-    return F0, F1
-
-def encrypt(K, k, S, PT):
-    PT = [struct.unpack('>I', struct.pack('<I', x))[0] for x in PT]
-    R = [PT[i] ^ K[i] for i in range(4)]
-
-    for r in range(ROUNDS):
-        NR = [0,0,0,0]
-        FR0, FR1 = F(R[0], R[1], r, K, k, S)
-        NR[2] = ROR(R[2] ^ FR0, 1)
-        NR[3] = ROL(R[3], 1) ^ FR1
-        NR[0] = R[0]
-        NR[1] = R[1]
-        R = NR
-        if (r < ROUNDS - 1):
-            R[0], R[2] = R[2], R[0]
-            R[1], R[3] = R[3], R[1]
-
-    R = [R[2], R[3], R[0], R[1]]
-    R = [R[(i+2) % 4] ^ K[i+4] for i in range(4)]
-    R = [struct.unpack('>I', struct.pack('<I', x))[0] for x in R]
-    return R
-
-def decrypt(K, k, S, PT):
-    PT = [struct.unpack('>I', struct.pack('<I', x))[0] for x in PT]
-    R = [PT[i] ^ K[i+4] for i in range(4)]
-
-    for r in range(ROUNDS-1, -1, -1):
-        NR = [0,0,0,0]
-        FR0, FR1 = F(R[0], R[1], r, K, k, S)
-        NR[2] = ROL(R[2], 1) ^ FR0
-        NR[3] = ROR(R[3] ^ FR1, 1)
-        NR[0] = R[0]
-        NR[1] = R[1]
-        R = NR
-        if (r > 0):
-            R[0], R[2] = R[2], R[0]
-            R[1], R[3] = R[3], R[1]
-        print(f'round[{r+1}]', [hex(x) for x in R])
-
-    R = [R[2], R[3], R[0], R[1]]
-    R = [R[(i+2) % 4] ^ K[i] for i in range(4)]
-    R = [struct.unpack('>I', struct.pack('<I', x))[0] for x in R]
-    return R
-
-def dispLongList(v):
-    return ''.join([f'{hex(x)[2:]:0>8}' for x in v])
-
-def Itest128():
-    ct = [0, 0, 0, 0]
-    k = [0, 0, 0, 0]
-
-    for i in range(49):
-        K, Kk, KS = keySched(k, 128)
-        nct = encrypt(K, Kk, KS, ct)
-        print()
-        print(f'I={i+1}')
-        print(f'KEY={dispLongList(k)}')
-        print(f'PT={dispLongList(ct)}')
-        print(f'CT={dispLongList(nct)}')
-        k = ct
-        ct = nct
-
-def Itest256():
-    ct = [0, 0, 0, 0]
-    k1 = [0, 0, 0, 0]
-    k2 = [0, 0, 0, 0]
-    
-    for i in range(49):
-        K, Kk, KS = keySched(k1 + k2, 256)
-        nct = encrypt(K, Kk, KS, ct)
-        print()
-        print(f'I={i+1}')
-        print(f'KEY={dispLongList(k1)}{dispLongList(k2)}')
-        print(f'PT={dispLongList(ct)}')
-        print(f'CT={dispLongList(nct)}')
-        k2 = k1
-        k1 = ct
-        ct = nct
-
-if __name__ == '__main__':
-    # Test with known values
-    K,k,S = keySched([0x9F589F5C, 0xF6122C32, 0xB6BFEC2F, 0x2AE8C35A], 128)
-    CT = encrypt(K, k, S, [0xD491DB16, 0xE7B1C39E, 0x86CB086B, 0x789F5419])
+import array
+import struct
+
+# GF modulus polynomials
+GF_MOD = 2**8 + 2**6 + 2**5 + 2**3 + 1
+RS_MOD = 2**8 + 2**6 + 2**3 + 2**2 + 1
+ROUNDS = 16
+
+def to32Char(X):
+    return list(struct.unpack('>BBBB', struct.pack('>I', X)))
+
+def bytesTo32Bits(l):
+    t = 0
+    for i in l:
+        t = t << 8
+        t = t + i
+    return t
+
+def _bswap32(x):
+    return ((x & 0xFF) << 24) | ((x & 0xFF00) << 8) | ((x >> 8) & 0xFF00) | ((x >> 24) & 0xFF)
+
+def ROR(x, n):
+    return ((x >> n) | (x << (32 - n))) & 0xFFFFFFFF
+
+def ROL(x, n):
+    return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+def ROR4(x, n):
+    return ((x >> n) | (x << (4 - n))) & 0xF
+
+def polyMult(a, b):
+    t = 0
+    while a:
+        if a & 1:
+            t = t ^ b
+        b = b << 1
+        a = a >> 1
+    return t
+
+def gfMod(t, modulus):
+    modulus = modulus << 7
+    for i in range(8):
+        tt = t ^ modulus
+        if tt < t:
+            t = tt
+        modulus = modulus >> 1
+    return t
+
+def _buildLogTables(modulus):
+    # Log/antilog tables over GF(2^8) for the given field polynomial,
+    # using the smallest multiplicative generator. The antilog table is
+    # doubled so gfMult never needs a % 255.
+    exp = [0] * 512
+    log = [0] * 256
+    for gen in range(2, 256):
+        x = 1
+        full_cycle = True
+        for i in range(255):
+            exp[i] = x
+            log[x] = i
+            x = gfMod(polyMult(x, gen), modulus)
+            if x == 1 and i < 254:
+                full_cycle = False
+                break
+        if full_cycle:
+            break
+    for i in range(255, 512):
+        exp[i] = exp[i - 255]
+    return exp, log
+
+_GF_TABLES = {}
+
+def gfMult(a, b, modulus):
+    if a == 0 or b == 0:
+        return 0
+    tables = _GF_TABLES.get(modulus)
+    if tables is None:
+        tables = _GF_TABLES[modulus] = _buildLogTables(modulus)
+    exp, log = tables
+    return exp[log[a] + log[b]]
+
+def matrixMultiply(md, sd, modulus):
+    # md is a flat row-major matrix with len(sd) columns
+    cols = len(sd)
+    r = []
+    for j in range(len(md) // cols):
+        t = 0
+        for k in range(cols):
+            t = t ^ gfMult(md[j*cols + k], sd[k], modulus)
+        r.insert(0, t)
+    return r
+
+def _matmul_to_word(md, sd):
+    # matrixMultiply + bytesTo32Bits fused: accumulate each row result
+    # straight into its byte of the output word (row j is byte j),
+    # skipping the intermediate list and its O(n) insert(0, ...) shifts.
+    out = 0
+    for j in range(4):
+        t = 0
+        for k in range(4):
+            t ^= gfMult(md[4*j + k], sd[k], GF_MOD)
+        out |= t << (8 * j)
+    return out
+
+# Constants, stored as flat row-major bytes: indexing a bytes object
+# returns a cached small int in one step, where the old nested lists
+# paid two object dereferences per lookup.
+MDS = bytes([
+    0x01, 0xEF, 0x5B, 0x5B,
+    0x5B, 0xEF, 0xEF, 0x01,
+    0xEF, 0x5B, 0x01, 0xEF,
+    0xEF, 0x01, 0xEF, 0x5B,
+])
+
+RS = bytes([
+    0x01, 0xA4, 0x55, 0x87, 0x5A, 0x58, 0xDB, 0x9E,
+    0xA4, 0x56, 0x82, 0xF3, 0x1E, 0xC6, 0x68, 0xE5,
+    0x02, 0xA1, 0xFC, 0xC1, 0x47, 0xAE, 0x3D, 0x19,
+    0xA4, 0x55, 0x87, 0x5A, 0x58, 0xDB, 0x9E, 0x03,
+])
+
+Q0 = bytes([
+    0x8, 0x1, 0x7, 0xD, 0x6, 0xF, 0x3, 0x2, 0x0, 0xB, 0x5, 0x9, 0xE, 0xC, 0xA, 0x4,
+    0xE, 0xC, 0xB, 0x8, 0x1, 0x2, 0x3, 0x5, 0xF, 0x4, 0xA, 0x6, 0x7, 0x0, 0x9, 0xD,
+    0xB, 0xA, 0x5, 0xE, 0x6, 0xD, 0x9, 0x0, 0xC, 0x8, 0xF, 0x3, 0x2, 0x4, 0x7, 0x1,
+    0xD, 0x7, 0xF, 0x4, 0x1, 0x2, 0x6, 0xE, 0x9, 0xB, 0x3, 0x0, 0x8, 0x5, 0xC, 0xA,
+])
+
+Q1 = bytes([
+    0x2, 0x8, 0xB, 0xD, 0xF, 0x7, 0x6, 0xE, 0x3, 0x1, 0x9, 0x4, 0x0, 0xA, 0xC, 0x5,
+    0x1, 0xE, 0x2, 0xB, 0x4, 0xC, 0x3, 0x7, 0x6, 0xD, 0xA, 0x5, 0xF, 0x9, 0x0, 0x8,
+    0x4, 0xC, 0x7, 0x5, 0x1, 0x6, 0x9, 0xA, 0x0, 0xE, 0xD, 0x8, 0x2, 0xB, 0x3, 0xF,
+    0xB, 0x9, 0x5, 0x1, 0xC, 0x3, 0xD, 0xE, 0x6, 0x4, 0x7, 0xF, 0x2, 0x0, 0x8, 0xA,
+])
+
+# Which Q permutation each byte lane passes through at each key stage
+Qdones = [
+    [Q1, Q0, Q1, Q0],
+    [Q0, Q0, Q1, Q1],
+    [Q0, Q1, Q0, Q1],
+    [Q1, Q1, Q0, Q0],
+    [Q1, Q0, Q0, Q1],
+]
+
+def printRoundKeys(K):
+    for i in range(0, len(K), 2):
+        print(f'{hex(K[i])[2:]:>8} {hex(K[i+1])[2:]:>8}')
+
+def keySched(M, N):
+    k = (N + 63) // 64
+    Me = [M[x] for x in range(0, (2*k-1), 2)]
+    Mo = [M[x] for x in range(1, (2*k), 2)]
+
+    S = []
+    for i in range(0, k):
+        x1 = to32Char(Me[i])
+        x2 = to32Char(Mo[i])
+        vector = x1 + x2
+        prod = matrixMultiply(RS, vector, RS_MOD)
+        prod.reverse()
+        S.insert(0, bytesTo32Bits(prod))
+
+    K = makeKey(Me, Mo, k)
+    return K, makeTtables(S, k)
+
+def makeTtables(S, k):
+    """Full keying: fold the S-box key bytes and the MDS multiply into
+    four 256-entry 32-bit tables so g() is four lookups and three XORs."""
+    l = [to32Char(Si) for Si in S]
+    T = []
+    for j in range(4):
+        Tj = array.array('I', bytes(4*256))
+        for v in range(256):
+            y = v
+            for i in range(k-1, -1, -1):
+                y = Qpermute(y, Qdones[i+1][j]) ^ l[i][j]
+            y = Qpermute(y, Qdones[0][j])
+            Tj[v] = ((gfMult(MDS[12 + j], y, GF_MOD) << 24)
+                     | (gfMult(MDS[8 + j], y, GF_MOD) << 16)
+                     | (gfMult(MDS[4 + j], y, GF_MOD) << 8)
+                     | gfMult(MDS[j], y, GF_MOD))
+        T.append(Tj)
+    return T
+
+def makeKey(Me, Mo, k):
+    K = []
+    rho = 0x01010101
+    for i in range(ROUNDS + 4):
+        A = h(2*i*rho, Me, k)
+        B = h((2*i+1)*rho, Mo, k)
+        B = ROL(B, 8)
+        K.append((A+B) & 0xFFFFFFFF)
+        K.append(ROL((A + 2*B) & 0xFFFFFFFF, 9))
+    return K
+
+def Qpermute(x, Q):
+    x = int(x)
+    a0, b0 = x//16, x % 16
+    a1 = a0 ^ b0
+    b1 = (a0 ^ ROR4(b0, 1) ^ (8*a0)) % 16
+    a2, b2 = Q[a1], Q[16 + b1]
+    a3 = a2 ^ b2
+    b3 = (a2 ^ ROR4(b2, 1) ^ (8*a2)) % 16
+    a4, b4 = Q[32 + a3], Q[48 + b3]
+    return (16 * b4) + a4
+
+def h(X, L, k):
+    x = to32Char(X)
+    x.reverse()
+    l = [to32Char(Li) for Li in L]
+    y = x[:]
+
+    for i in range(k-1, -1, -1):
+        for j in range(4):
+            y[j] = Qpermute(y[j], Qdones[i+1][j]) ^ l[i][j]
+            
+    for j in range(4):
+        y[j] = Qpermute(y[j], Qdones[0][j])
+
+    return _matmul_to_word(MDS, y)
+
+def g(X, T):
+    return (T[0][X & 0xFF] ^ T[1][(X >> 8) & 0xFF]
+            ^ T[2][(X >> 16) & 0xFF] ^ T[3][(X >> 24) & 0xFF])
+
+def F(R0, R1, r, K, T):
+    T0 = g(R0, T)
+    T1 = g(ROL(R1, 8), T)
+    F0 = (T0 + T1 + K[2*r+8]) & 0xFFFFFFFF
+    F1 = (T0 + 2*T1 + K[2*r+9]) & 0xFFFFFFFF
+    return F0, F1
+
+def encrypt(K, T, PT):
+    # Round state held in four locals; the half swap is folded into the
+    # tuple reassignment so no per-round list is allocated.
+    r0 = _bswap32(PT[0]) ^ K[0]
+    r1 = _bswap32(PT[1]) ^ K[1]
+    r2 = _bswap32(PT[2]) ^ K[2]
+    r3 = _bswap32(PT[3]) ^ K[3]
+
+    for r in range(ROUNDS):
+        FR0, FR1 = F(r0, r1, r, K, T)
+        r0, r1, r2, r3 = ROR(r2 ^ FR0, 1), ROL(r3, 1) ^ FR1, r0, r1
+
+    return [_bswap32(r2 ^ K[4]), _bswap32(r3 ^ K[5]),
+            _bswap32(r0 ^ K[6]), _bswap32(r1 ^ K[7])]
+
+def decrypt(K, T, PT):
+    r0 = _bswap32(PT[0]) ^ K[4]
+    r1 = _bswap32(PT[1]) ^ K[5]
+    r2 = _bswap32(PT[2]) ^ K[6]
+    r3 = _bswap32(PT[3]) ^ K[7]
+
+    for r in range(ROUNDS-1, -1, -1):
+        FR0, FR1 = F(r0, r1, r, K, T)
+        r0, r1, r2, r3 = ROL(r2, 1) ^ FR0, ROR(r3 ^ FR1, 1), r0, r1
+
+    return [_bswap32(r2 ^ K[0]), _bswap32(r3 ^ K[1]),
+            _bswap32(r0 ^ K[2]), _bswap32(r1 ^ K[3])]
+
+def dispLongList(v):
+    return ''.join([f'{hex(x)[2:]:0>8}' for x in v])
+
+def Itest128():
+    ct = [0, 0, 0, 0]
+    k = [0, 0, 0, 0]
+
+    for i in range(49):
+        K, T = keySched(k, 128)
+        nct = encrypt(K, T, ct)
+        print()
+        print(f'I={i+1}')
+        print(f'KEY={dispLongList(k)}')
+        print(f'PT={dispLongList(ct)}')
+        print(f'CT={dispLongList(nct)}')
+        k = ct
+        ct = nct
+
+def Itest256():
+    ct = [0, 0, 0, 0]
+    k1 = [0, 0, 0, 0]
+    k2 = [0, 0, 0, 0]
+    
+    for i in range(49):
+        K, T = keySched(k1 + k2, 256)
+        nct = encrypt(K, T, ct)
+        print()
+        print(f'I={i+1}')
+        print(f'KEY={dispLongList(k1)}{dispLongList(k2)}')
+        print(f'PT={dispLongList(ct)}')
+        print(f'CT={dispLongList(nct)}')
+        k2 = k1
+        k1 = ct
+        ct = nct
+
+if __name__ == '__main__':
+    # Test with known values
+    K, T = keySched([0x9F589F5C, 0xF6122C32, 0xB6BFEC2F, 0x2AE8C35A], 128)
+    CT = encrypt(K, T, [0xD491DB16, 0xE7B1C39E, 0x86CB086B, 0x789F5419])
     print(dispLongList(CT))
\ No newline at end of file
@@ -4,15 +4,26 @@ This module includes Twofish encryption and a hybrid cryptosystem with Multi-Pow
 """
 
 import hashlib
+import os
 from _twofish import Twofish as _Twofish
 from .hybrid import HybridCryptosystem
 from .c_multipowerrsa import MultiPowerRSA
 
+# Bind the constructor once; hashlib.sha256 is OpenSSL-backed and picks
+# up hardware SHA extensions where the host CPU has them
+_sha256 = hashlib.sha256
+
+# PKCS#7 pad strings indexed by pad length, built once at import
+_PKCS7_PAD = [b""] + [bytes([i]) * i for i in range(1, 17)]
+
 def derive_key(key_material, size=16):
     """Convert any input to a valid key of specified size (16, 24, or 32 bytes)"""
+    # Already a key of the requested size: nothing to derive
+    if isinstance(key_material, bytes) and len(key_material) == size:
+        return key_material
     if isinstance(key_material, str):
         key_material = key_material.encode('utf-8')
-    return hashlib.sha256(key_material).digest()[:size]
+    return _sha256(key_material).digest()[:size]
 
 class Twofish:
     """
@@ -87,86 +98,130 @@ class Twofish:
             raise ValueError("Data must be exactly 16 bytes")
             
         return self._cipher.decrypt(data)
-    
+
+    def encrypt_many(self, data):
+        """
+        Encrypt a contiguous run of 16-byte blocks in one C call.
+
+        No padding is applied; the whole buffer crosses the extension
+        boundary once and is processed with the GIL released.
+
+        Args:
+            data (bytes-like): Blocks to encrypt, length a multiple of 16
+
+        Returns:
+            bytes: Encrypted blocks of the same length
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("Data must be a bytes-like object")
+
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be a multiple of 16 bytes")
+
+        return self._cipher.encrypt_blocks(data)
+
+    def decrypt_many(self, data):
+        """
+        Decrypt a contiguous run of 16-byte blocks in one C call.
+
+        No padding is removed; the inverse of encrypt_many.
+
+        Args:
+            data (bytes-like): Blocks to decrypt, length a multiple of 16
+
+        Returns:
+            bytes: Decrypted blocks of the same length
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("Data must be a bytes-like object")
+
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be a multiple of 16 bytes")
+
+        return self._cipher.decrypt_blocks(data)
+
     def encrypt(self, data, mode='ecb', iv=None, padding=True):
-        if not isinstance(data, bytes):
-            raise TypeError("Data must be bytes")
-        
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("Data must be a bytes-like object")
+
         original_length = len(data)
-        
+
         # Always pad to full 16-byte blocks
         if padding:
             pad_length = 16 - (original_length % 16)
             if pad_length == 0:
                 pad_length = 16
-            data = data + bytes([pad_length]) * pad_length
+            if isinstance(data, memoryview):
+                # memoryview cannot be concatenated; copy only when the
+                # pad actually has to be appended
+                data = bytes(data)
+            data = data + _PKCS7_PAD[pad_length]
         
         result = bytearray()
-        
+
         if mode.lower() == 'ecb':
-            for i in range(0, len(data), 16):
-                block = data[i:i+16]
-                encrypted_block = self.encrypt_block(block)
-                result.extend(encrypted_block)
-        
+            # Encrypt all blocks in a single C call
+            return self._cipher.encrypt_blocks(data)
+
         elif mode.lower() == 'cbc':
+            # Chain the whole buffer inside the extension: one boundary
+            # crossing instead of an XOR plus C call per block
             if iv is None:
+                # Generate an IV and ship it as the first block
                 iv = os.urandom(16)
-            
+                return iv + self._cipher.cbc_encrypt(data, iv)
+
             if len(iv) != 16:
                 raise ValueError("IV must be 16 bytes for CBC mode")
-            
-            result.extend(iv)
-            prev_block = iv
-            
-            for i in range(0, len(data), 16):
-                block = data[i:i+16]
-                xored = bytes(a ^ b for a, b in zip(block, prev_block))
-                encrypted_block = self.encrypt_block(xored)
-                result.extend(encrypted_block)
-                prev_block = encrypted_block
-        
+
+            # The caller supplied the IV, so the caller keeps it: return
+            # the bare ciphertext, the mirror of decrypt(..., iv=iv)
+            return self._cipher.cbc_encrypt(data, iv)
+
         return bytes(result)
 
     def decrypt(self, data, mode='ecb', iv=None, padding=True):
-        if not isinstance(data, bytes):
-            raise TypeError("Data must be bytes")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("Data must be a bytes-like object")
         
         if len(data) == 0 or len(data) % 16 != 0:
             raise ValueError("Encrypted data length must be a non-zero multiple of 16 bytes")
         
-        result = bytearray()
-        
+        # The extension writes into an exactly sized output buffer, so the
+        # bytes it returns can be used as-is without a bytearray copy
+        result = b""
+
         if mode.lower() == 'ecb':
-            for i in range(0, len(data), 16):
-                block = data[i:i+16]
-                decrypted_block = self.decrypt_block(block)
-                result.extend(decrypted_block)
-        
+            # Decrypt all blocks in a single C call
+            result = self._cipher.decrypt_blocks(data)
+
         elif mode.lower() == 'cbc':
-            if len(data) < 16:
-                raise ValueError("CBC mode requires at least 16 bytes for IV")
-            
-            iv = data[:16]
-            data = data[16:]
-            
-            prev_block = iv
-            
-            for i in range(0, len(data), 16):
-                block = data[i:i+16]
-                decrypted_block = self.decrypt_block(block)
-                xored = bytes(a ^ b for a, b in zip(decrypted_block, prev_block))
-                result.extend(xored)
-                prev_block = block
-        
-        # Remove padding if requested
+            if iv is None:
+                # The IV travels as the first block of the ciphertext
+                if len(data) < 16:
+                    raise ValueError("CBC mode requires at least 16 bytes for IV")
+                iv, data = data[:16], data[16:]
+            elif len(iv) != 16:
+                raise ValueError("IV must be 16 bytes for CBC mode")
+
+            # Chain the whole buffer inside the extension
+            result = self._cipher.cbc_decrypt(data, iv)
+
+        # Remove padding if requested. The check always scans the final
+        # 16 bytes with a mask instead of slicing pad_length bytes, so
+        # neither the work done nor the branches taken depend on the
+        # (secret) pad value - a padding-oracle countermeasure
         if padding and result:
             pad_length = result[-1]
-            if 0 < pad_length <= 16:
-                if all(x == pad_length for x in result[-pad_length:]):
-                    result = result[:-pad_length]
-        
-        return bytes(result)
+            tail = result[-16:]
+            diff = 0
+            for i in range(16):
+                mask = -(i >= 16 - pad_length) & 0xFF
+                diff |= (tail[i] ^ pad_length) & mask
+            valid = 1 <= pad_length <= 16 and diff == 0
+            result = result[:len(result) - (pad_length if valid else 0)]
+
+        return result
 
 # Utility functions
 def new(key, auto_derive=False):
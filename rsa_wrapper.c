@@ -7,12 +7,161 @@
 typedef struct {
     PyObject_HEAD
     mp_rsa_ctx ctx;
+    /* Contexts holding the most recently imported explicit keys, so
+       repeat calls with the same key bytes skip the hex parse and the
+       p_power / Garner coefficient recomputation */
+    PyObject *cached_public_key;
+    PyObject *cached_private_key;
+    mp_rsa_ctx public_ctx;
+    mp_rsa_ctx private_ctx;
+    int public_ctx_ready;
+    int private_ctx_ready;
 } MPRSAObject;
 
+/* Bridge Python ints and mpz_t through big-endian byte buffers.
+   Going through base-10 strings costs O(n^2) in the operand size;
+   mpz_import/mpz_export stream the limbs directly. */
+
+static int
+mpz_set_pylong(mpz_t rop, PyObject *obj)
+{
+    size_t nbits, nbytes;
+    unsigned char *buf;
+
+    nbits = _PyLong_NumBits(obj);
+    if (nbits == (size_t)-1 && PyErr_Occurred())
+        return -1;
+
+    nbytes = nbits / 8 + 1;
+    buf = malloc(nbytes);
+    if (!buf) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    if (_PyLong_AsByteArray((PyLongObject *)obj, buf, nbytes, 0, 0) < 0) {
+        free(buf);
+        return -1;
+    }
+
+    mpz_import(rop, nbytes, 1, 1, 0, 0, buf);
+    free(buf);
+    return 0;
+}
+
+static PyObject *
+pylong_from_mpz(const mpz_t op)
+{
+    size_t nbytes = (mpz_sizeinbase(op, 2) + 7) / 8;
+    size_t written = 0;
+    unsigned char *buf;
+    PyObject *result;
+
+    buf = malloc(nbytes);
+    if (!buf) {
+        PyErr_SetString(PyExc_MemoryError, "Failed to allocate conversion buffer");
+        return NULL;
+    }
+
+    mpz_export(buf, &written, 1, 1, 0, 0, op);
+    result = _PyLong_FromByteArray(buf, written, 0, 0);
+    free(buf);
+    return result;
+}
+
+static PyObject *
+pybytes_from_mpz(const mpz_t op)
+{
+    size_t nbytes = (mpz_sizeinbase(op, 2) + 7) / 8;
+    size_t written = 0;
+    PyObject *result;
+
+    result = PyBytes_FromStringAndSize(NULL, nbytes);
+    if (!result)
+        return NULL;
+
+    mpz_export(PyBytes_AS_STRING(result), &written, 1, 1, 0, 0, op);
+    if (written < nbytes) {
+        /* Only possible for op == 0, which exports no bytes */
+        memset(PyBytes_AS_STRING(result), 0, nbytes);
+    }
+
+    return result;
+}
+
+static int
+same_key_bytes(PyObject *cached, PyObject *key_obj)
+{
+    if (cached == key_obj)
+        return 1;
+    if (cached == NULL)
+        return 0;
+    return PyBytes_GET_SIZE(cached) == PyBytes_GET_SIZE(key_obj) &&
+           memcmp(PyBytes_AS_STRING(cached), PyBytes_AS_STRING(key_obj),
+                  PyBytes_GET_SIZE(key_obj)) == 0;
+}
+
+/* Return a context holding the given explicit public key, importing the
+   key bytes only when they differ from the previous call */
+static mp_rsa_ctx *
+MPRSA_public_ctx(MPRSAObject *self, PyObject *key_obj)
+{
+    if (self->public_ctx_ready && same_key_bytes(self->cached_public_key, key_obj))
+        return &self->public_ctx;
+
+    if (!self->public_ctx_ready) {
+        mp_rsa_init(&self->public_ctx, self->ctx.key_size, self->ctx.b);
+        self->public_ctx_ready = 1;
+    }
+
+    if (mp_rsa_import_public_key(&self->public_ctx,
+                                 (unsigned char *)PyBytes_AS_STRING(key_obj),
+                                 PyBytes_GET_SIZE(key_obj)) != 0) {
+        PyErr_SetString(PyExc_ValueError, "Invalid public key format");
+        Py_CLEAR(self->cached_public_key);
+        return NULL;
+    }
+
+    Py_INCREF(key_obj);
+    Py_XSETREF(self->cached_public_key, key_obj);
+    return &self->public_ctx;
+}
+
+/* Private-key counterpart of MPRSA_public_ctx */
+static mp_rsa_ctx *
+MPRSA_private_ctx(MPRSAObject *self, PyObject *key_obj)
+{
+    if (self->private_ctx_ready && same_key_bytes(self->cached_private_key, key_obj))
+        return &self->private_ctx;
+
+    if (!self->private_ctx_ready) {
+        mp_rsa_init(&self->private_ctx, self->ctx.key_size, self->ctx.b);
+        self->private_ctx_ready = 1;
+    }
+
+    if (mp_rsa_import_private_key(&self->private_ctx,
+                                  (unsigned char *)PyBytes_AS_STRING(key_obj),
+                                  PyBytes_GET_SIZE(key_obj)) != 0) {
+        PyErr_SetString(PyExc_ValueError, "Invalid private key format");
+        Py_CLEAR(self->cached_private_key);
+        return NULL;
+    }
+
+    Py_INCREF(key_obj);
+    Py_XSETREF(self->cached_private_key, key_obj);
+    return &self->private_ctx;
+}
+
 static void
 MPRSA_dealloc(MPRSAObject *self)
 {
     mp_rsa_clear(&self->ctx);
+    if (self->public_ctx_ready)
+        mp_rsa_clear(&self->public_ctx);
+    if (self->private_ctx_ready)
+        mp_rsa_clear(&self->private_ctx);
+    Py_XDECREF(self->cached_public_key);
+    Py_XDECREF(self->cached_private_key);
     Py_TYPE(self)->tp_free((PyObject *)self);
 }
 
@@ -23,6 +172,10 @@ MPRSA_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self = (MPRSAObject *)type->tp_alloc(type, 0);
     if (self != NULL) {
         mp_rsa_init(&self->ctx, 2048, 3); // Default values
+        self->cached_public_key = NULL;
+        self->cached_private_key = NULL;
+        self->public_ctx_ready = 0;
+        self->private_ctx_ready = 0;
     }
     return (PyObject *)self;
 }
@@ -40,7 +193,19 @@ MPRSA_init(MPRSAObject *self, PyObject *args, PyObject *kwds)
     // Re-initialize with user-provided parameters
     mp_rsa_clear(&self->ctx);
     mp_rsa_init(&self->ctx, key_size, b);
-    
+
+    // Drop any cached key contexts built against the old parameters
+    if (self->public_ctx_ready) {
+        mp_rsa_clear(&self->public_ctx);
+        self->public_ctx_ready = 0;
+    }
+    if (self->private_ctx_ready) {
+        mp_rsa_clear(&self->private_ctx);
+        self->private_ctx_ready = 0;
+    }
+    Py_CLEAR(self->cached_public_key);
+    Py_CLEAR(self->cached_private_key);
+
     return 0;
 }
 
@@ -118,15 +283,11 @@ MPRSA_encrypt(MPRSAObject *self, PyObject *args, PyObject *kwds)
     
     if (PyLong_Check(message_obj)) {
         // If message is a Python integer
-        PyObject *str_obj = PyObject_Str(message_obj);
-        if (!str_obj) {
+        if (mpz_set_pylong(message, message_obj) < 0) {
             mpz_clear(message);
             return NULL;
         }
-        const char *str = PyUnicode_AsUTF8(str_obj);
-        mpz_set_str(message, str, 10);
-        Py_DECREF(str_obj);
-    } 
+    }
     else if (PyBytes_Check(message_obj)) {
         // If message is bytes
         unsigned char *data = (unsigned char *)PyBytes_AS_STRING(message_obj);
@@ -146,57 +307,40 @@ MPRSA_encrypt(MPRSAObject *self, PyObject *args, PyObject *kwds)
     }
     
     // Handle public key if provided
-    mp_rsa_ctx temp_ctx;
     mp_rsa_ctx *ctx_to_use = &self->ctx;
-    
+
     if (public_key_obj && public_key_obj != Py_None) {
         if (!PyBytes_Check(public_key_obj)) {
             PyErr_SetString(PyExc_TypeError, "Public key must be bytes");
             mpz_clear(message);
             return NULL;
         }
-        
-        mp_rsa_init(&temp_ctx, self->ctx.key_size, self->ctx.b);
-        int result = mp_rsa_import_public_key(&temp_ctx, 
-                                             (unsigned char *)PyBytes_AS_STRING(public_key_obj),
-                                             PyBytes_GET_SIZE(public_key_obj));
-        
-        if (result != 0) {
-            PyErr_SetString(PyExc_ValueError, "Invalid public key format");
-            mp_rsa_clear(&temp_ctx);
+
+        ctx_to_use = MPRSA_public_ctx(self, public_key_obj);
+        if (ctx_to_use == NULL) {
             mpz_clear(message);
             return NULL;
         }
-        
-        ctx_to_use = &temp_ctx;
     }
-    
+
     // Encrypt the message
     mpz_t cipher;
     mpz_init(cipher);
-    
+
     if (mp_rsa_encrypt(ctx_to_use, message, cipher) != 0) {
         PyErr_SetString(PyExc_ValueError, "Encryption failed");
-        if (public_key_obj && public_key_obj != Py_None) {
-            mp_rsa_clear(&temp_ctx);
-        }
         mpz_clear(message);
         mpz_clear(cipher);
         return NULL;
     }
-    
-    // Convert cipher to string and create Python object
-    char *cipher_str = mpz_get_str(NULL, 10, cipher);
-    PyObject *result = PyUnicode_FromString(cipher_str);
-    
+
+    // Export the cipher as big-endian bytes
+    PyObject *result = pybytes_from_mpz(cipher);
+
     // Clean up
-    free(cipher_str);
     mpz_clear(message);
     mpz_clear(cipher);
-    if (public_key_obj && public_key_obj != Py_None) {
-        mp_rsa_clear(&temp_ctx);
-    }
-    
+
     return result;
 }
 
@@ -210,84 +354,66 @@ MPRSA_decrypt(MPRSAObject *self, PyObject *args, PyObject *kwds)
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &cipher_obj, &private_key_obj))
         return NULL;
     
-    // Handle cipher input - should be string representing integer
+    // Handle cipher input - could be bytes, a decimal string, or an integer
     mpz_t cipher;
     mpz_init(cipher);
-    
-    if (PyUnicode_Check(cipher_obj)) {
+
+    if (PyBytes_Check(cipher_obj)) {
+        mpz_import(cipher, PyBytes_GET_SIZE(cipher_obj), 1, 1, 0, 0,
+                   PyBytes_AS_STRING(cipher_obj));
+    }
+    else if (PyUnicode_Check(cipher_obj)) {
         const char *str = PyUnicode_AsUTF8(cipher_obj);
         mpz_set_str(cipher, str, 10);
     }
     else if (PyLong_Check(cipher_obj)) {
-        PyObject *str_obj = PyObject_Str(cipher_obj);
-        if (!str_obj) {
+        if (mpz_set_pylong(cipher, cipher_obj) < 0) {
             mpz_clear(cipher);
             return NULL;
         }
-        const char *str = PyUnicode_AsUTF8(str_obj);
-        mpz_set_str(cipher, str, 10);
-        Py_DECREF(str_obj);
     }
     else {
-        PyErr_SetString(PyExc_TypeError, "Cipher must be a string or integer");
+        PyErr_SetString(PyExc_TypeError, "Cipher must be bytes, a string or an integer");
         mpz_clear(cipher);
         return NULL;
     }
     
     // Handle private key if provided
-    mp_rsa_ctx temp_ctx;
     mp_rsa_ctx *ctx_to_use = &self->ctx;
-    
+
     if (private_key_obj && private_key_obj != Py_None) {
         if (!PyBytes_Check(private_key_obj)) {
             PyErr_SetString(PyExc_TypeError, "Private key must be bytes");
             mpz_clear(cipher);
             return NULL;
         }
-        
-        mp_rsa_init(&temp_ctx, self->ctx.key_size, self->ctx.b);
-        int result = mp_rsa_import_private_key(&temp_ctx, 
-                                              (unsigned char *)PyBytes_AS_STRING(private_key_obj),
-                                              PyBytes_GET_SIZE(private_key_obj));
-        
-        if (result != 0) {
-            PyErr_SetString(PyExc_ValueError, "Invalid private key format");
-            mp_rsa_clear(&temp_ctx);
+
+        ctx_to_use = MPRSA_private_ctx(self, private_key_obj);
+        if (ctx_to_use == NULL) {
             mpz_clear(cipher);
             return NULL;
         }
-        
-        ctx_to_use = &temp_ctx;
     }
-    
+
     // Decrypt the cipher
     mpz_t message;
     mpz_init(message);
-    
+
     if (mp_rsa_decrypt(ctx_to_use, cipher, message) != 0) {
         PyErr_SetString(PyExc_ValueError, "Decryption failed");
-        if (private_key_obj && private_key_obj != Py_None) {
-            mp_rsa_clear(&temp_ctx);
-        }
         mpz_clear(cipher);
         mpz_clear(message);
         return NULL;
     }
-    
+
     // Result can be returned as integer or bytes
     // Default to integer since RSA typically works with integers
-    PyObject *result = NULL;
-    char *message_str = mpz_get_str(NULL, 10, message);
-    result = PyLong_FromString(message_str, NULL, 10);
-    
+    PyObject *result = pylong_from_mpz(message);
+
     // Clean up
-    free(message_str);
     mpz_clear(cipher);
     mpz_clear(message);
-    if (private_key_obj && private_key_obj != Py_None) {
-        mp_rsa_clear(&temp_ctx);
-    }
-    
+
     return result;
 }
 
@@ -298,7 +424,7 @@ static PyMethodDef MPRSA_methods[] = {
     {"generate_keys", (PyCFunction)MPRSA_generate_keys, METH_NOARGS,
      "Generate a new Multi-Power RSA key pair"},
     {"encrypt", (PyCFunction)MPRSA_encrypt, METH_VARARGS | METH_KEYWORDS,
-     "Encrypt a message using the public key"},
+     "Encrypt a message using the public key and return the cipher as bytes"},
     {"decrypt", (PyCFunction)MPRSA_decrypt, METH_VARARGS | METH_KEYWORDS,
      "Decrypt a message using the private key and return as integer"},
     {"decrypt_to_bytes", (PyCFunction)MPRSA_decrypt_to_bytes, METH_VARARGS | METH_KEYWORDS,
@@ -359,96 +485,78 @@ MPRSA_decrypt_to_bytes(MPRSAObject *self, PyObject *args, PyObject *kwds)
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &cipher_obj, &private_key_obj))
         return NULL;
     
-    // Handle cipher input - should be string representing integer
+    // Handle cipher input - could be bytes, a decimal string, or an integer
     mpz_t cipher;
     mpz_init(cipher);
-    
-    if (PyUnicode_Check(cipher_obj)) {
+
+    if (PyBytes_Check(cipher_obj)) {
+        mpz_import(cipher, PyBytes_GET_SIZE(cipher_obj), 1, 1, 0, 0,
+                   PyBytes_AS_STRING(cipher_obj));
+    }
+    else if (PyUnicode_Check(cipher_obj)) {
         const char *str = PyUnicode_AsUTF8(cipher_obj);
         mpz_set_str(cipher, str, 10);
     }
     else if (PyLong_Check(cipher_obj)) {
-        PyObject *str_obj = PyObject_Str(cipher_obj);
-        if (!str_obj) {
+        if (mpz_set_pylong(cipher, cipher_obj) < 0) {
             mpz_clear(cipher);
             return NULL;
         }
-        const char *str = PyUnicode_AsUTF8(str_obj);
-        mpz_set_str(cipher, str, 10);
-        Py_DECREF(str_obj);
     }
     else {
-        PyErr_SetString(PyExc_TypeError, "Cipher must be a string or integer");
+        PyErr_SetString(PyExc_TypeError, "Cipher must be bytes, a string or an integer");
         mpz_clear(cipher);
         return NULL;
     }
     
     // Handle private key if provided
-    mp_rsa_ctx temp_ctx;
     mp_rsa_ctx *ctx_to_use = &self->ctx;
-    
+
     if (private_key_obj && private_key_obj != Py_None) {
         if (!PyBytes_Check(private_key_obj)) {
             PyErr_SetString(PyExc_TypeError, "Private key must be bytes");
             mpz_clear(cipher);
             return NULL;
         }
-        
-        mp_rsa_init(&temp_ctx, self->ctx.key_size, self->ctx.b);
-        int result = mp_rsa_import_private_key(&temp_ctx, 
-                                              (unsigned char *)PyBytes_AS_STRING(private_key_obj),
-                                              PyBytes_GET_SIZE(private_key_obj));
-        
-        if (result != 0) {
-            PyErr_SetString(PyExc_ValueError, "Invalid private key format");
-            mp_rsa_clear(&temp_ctx);
+
+        ctx_to_use = MPRSA_private_ctx(self, private_key_obj);
+        if (ctx_to_use == NULL) {
             mpz_clear(cipher);
             return NULL;
         }
-        
-        ctx_to_use = &temp_ctx;
     }
-    
+
     // Decrypt the cipher
     mpz_t message;
     mpz_init(message);
-    
+
     if (mp_rsa_decrypt(ctx_to_use, cipher, message) != 0) {
         PyErr_SetString(PyExc_ValueError, "Decryption failed");
-        if (private_key_obj && private_key_obj != Py_None) {
-            mp_rsa_clear(&temp_ctx);
-        }
         mpz_clear(cipher);
         mpz_clear(message);
         return NULL;
     }
-    
+
     // Convert message to bytes
     size_t buffer_size = (mpz_sizeinbase(message, 2) + 7) / 8;
     void *buffer = malloc(buffer_size);
-    
+
     if (!buffer) {
         PyErr_SetString(PyExc_MemoryError, "Failed to allocate memory for decrypted data");
-        if (private_key_obj && private_key_obj != Py_None) {
-            mp_rsa_clear(&temp_ctx);
-        }
         mpz_clear(cipher);
         mpz_clear(message);
         return NULL;
     }
-    
+
     size_t written;
     mpz_export(buffer, &written, 1, 1, 0, 0, message);
-    
+
     PyObject *result = PyBytes_FromStringAndSize(buffer, written);
-    
+
     // Clean up
     free(buffer);
     mpz_clear(cipher);
     mpz_clear(message);
-    if (private_key_obj && private_key_obj != Py_None) {
-        mp_rsa_clear(&temp_ctx);
-    }
-    
+
     return result;
 }
\ No newline at end of file
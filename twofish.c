@@ -4,6 +4,20 @@
 #include "tables.h"
 #include "twofish.h"
 
+#if defined(__SSSE3__)
+#include <tmmintrin.h>
+#endif
+
+/* Bulk operations fan out across threads when built with OpenMP and the
+   payload is large enough to pay for the fork/join: 4096 blocks is
+   64 KiB. CBC decryption is split into chunks whose chaining inputs are
+   saved up front, since every chunk needs only the ciphertext block
+   that precedes it */
+#ifdef _OPENMP
+#define OMP_MIN_BLOCKS 4096
+#define OMP_CBC_CHUNK  1024
+#endif
+
 /* 
    gcc is smart enough to convert these to roll instructions.
 */
@@ -118,12 +132,92 @@ static u32 h(u32 X, u32 L[4], int k)
     return BYTES_TO_U32(z0, z1, z2, z3);
 }
 
+#if defined(__SSSE3__)
+
+/* rotate each 4-bit value (stored one per byte) right by one */
+static __m128i ror4_1(__m128i b, __m128i low4)
+{
+    return _mm_and_si128(_mm_or_si128(_mm_srli_epi16(b, 1),
+                                      _mm_slli_epi16(b, 3)), low4);
+}
+
+/* Run the full Q permutation on 16 bytes at once. The four 16-entry
+   nibble tables each fit in one XMM register, so every sub-lookup is a
+   single pshufb — branchless and constant-time (no data-dependent
+   memory addresses, unlike the composed 256-entry table walk). */
+static __m128i qpermute16(__m128i x, const BYTE qt[4][16])
+{
+    const __m128i low4 = _mm_set1_epi8(0x0F);
+    __m128i t0 = _mm_loadu_si128((const __m128i*)qt[0]);
+    __m128i t1 = _mm_loadu_si128((const __m128i*)qt[1]);
+    __m128i t2 = _mm_loadu_si128((const __m128i*)qt[2]);
+    __m128i t3 = _mm_loadu_si128((const __m128i*)qt[3]);
+    __m128i a0, b0, a1, b1, a2, b2, a3, b3, a4, b4;
+
+    a0 = _mm_and_si128(_mm_srli_epi16(x, 4), low4);
+    b0 = _mm_and_si128(x, low4);
+    a1 = _mm_xor_si128(a0, b0);
+    b1 = _mm_and_si128(_mm_xor_si128(_mm_xor_si128(a0, ror4_1(b0, low4)),
+                                     _mm_slli_epi16(a0, 3)), low4);
+    a2 = _mm_shuffle_epi8(t0, a1);
+    b2 = _mm_shuffle_epi8(t1, b1);
+    a3 = _mm_xor_si128(a2, b2);
+    b3 = _mm_and_si128(_mm_xor_si128(_mm_xor_si128(a2, ror4_1(b2, low4)),
+                                     _mm_slli_epi16(a2, 3)), low4);
+    a4 = _mm_shuffle_epi8(t2, a3);
+    b4 = _mm_shuffle_epi8(t3, b3);
+    return _mm_or_si128(_mm_slli_epi16(b4, 4), a4);
+}
+
+#endif /* __SSSE3__ */
+
 /* given the Sbox keys, create the fully keyed QF */
 static void fullKey(u32 L[4], int k, u32 QF[4][256])
 {
+    BYTE ya[4][256];
     BYTE y0, y1, y2, y3;
     int i;
-    
+
+#if defined(__SSSE3__)
+    /* run the Q permutations for all 256 inputs, 16 lanes at a time;
+       every lookup is a pshufb so the key-dependent XOR stages never
+       form data-dependent addresses */
+    {
+        const __m128i ramp = _mm_setr_epi8(0, 1, 2, 3, 4, 5, 6, 7,
+                                           8, 9, 10, 11, 12, 13, 14, 15);
+        for (i = 0; i < 256; i += 16)
+        {
+            __m128i x = _mm_add_epi8(_mm_set1_epi8((char)i), ramp);
+            __m128i v0 = x, v1 = x, v2 = x, v3 = x;
+            switch(k)
+            {
+                case 4:
+                    v0 = _mm_xor_si128(qpermute16(v0, Q1t), _mm_set1_epi8((char)b0(L[3])));
+                    v1 = _mm_xor_si128(qpermute16(v1, Q0t), _mm_set1_epi8((char)b1(L[3])));
+                    v2 = _mm_xor_si128(qpermute16(v2, Q0t), _mm_set1_epi8((char)b2(L[3])));
+                    v3 = _mm_xor_si128(qpermute16(v3, Q1t), _mm_set1_epi8((char)b3(L[3])));
+                case 3:
+                    v0 = _mm_xor_si128(qpermute16(v0, Q1t), _mm_set1_epi8((char)b0(L[2])));
+                    v1 = _mm_xor_si128(qpermute16(v1, Q1t), _mm_set1_epi8((char)b1(L[2])));
+                    v2 = _mm_xor_si128(qpermute16(v2, Q0t), _mm_set1_epi8((char)b2(L[2])));
+                    v3 = _mm_xor_si128(qpermute16(v3, Q0t), _mm_set1_epi8((char)b3(L[2])));
+                case 2:
+                    v0 = qpermute16(_mm_xor_si128(qpermute16(_mm_xor_si128(qpermute16(v0, Q0t),
+                             _mm_set1_epi8((char)b0(L[1]))), Q0t), _mm_set1_epi8((char)b0(L[0]))), Q1t);
+                    v1 = qpermute16(_mm_xor_si128(qpermute16(_mm_xor_si128(qpermute16(v1, Q1t),
+                             _mm_set1_epi8((char)b1(L[1]))), Q0t), _mm_set1_epi8((char)b1(L[0]))), Q0t);
+                    v2 = qpermute16(_mm_xor_si128(qpermute16(_mm_xor_si128(qpermute16(v2, Q0t),
+                             _mm_set1_epi8((char)b2(L[1]))), Q1t), _mm_set1_epi8((char)b2(L[0]))), Q1t);
+                    v3 = qpermute16(_mm_xor_si128(qpermute16(_mm_xor_si128(qpermute16(v3, Q1t),
+                             _mm_set1_epi8((char)b3(L[1]))), Q1t), _mm_set1_epi8((char)b3(L[0]))), Q0t);
+            }
+            _mm_storeu_si128((__m128i*)(ya[0] + i), v0);
+            _mm_storeu_si128((__m128i*)(ya[1] + i), v1);
+            _mm_storeu_si128((__m128i*)(ya[2] + i), v2);
+            _mm_storeu_si128((__m128i*)(ya[3] + i), v3);
+        }
+    }
+#else
     /* for all input values to the Q permutations */
     for (i=0; i<256; i++)
     {
@@ -147,7 +241,18 @@ static void fullKey(u32 L[4], int k, u32 QF[4][256])
                 y2 = Q1[  Q1 [ Q0[y2] ^ b2(L[1]) ] ^ b2(L[0]) ];
                 y3 = Q0[  Q1 [ Q1[y3] ^ b3(L[1]) ] ^ b3(L[0]) ];
         }
-    
+
+        ya[0][i] = y0;
+        ya[1][i] = y1;
+        ya[2][i] = y2;
+        ya[3][i] = y3;
+    }
+#endif
+
+    for (i=0; i<256; i++)
+    {
+        y0 = ya[0][i]; y1 = ya[1][i]; y2 = ya[2][i]; y3 = ya[3][i];
+
         /* now do the partial MDS matrix multiplies */
         QF[0][i] = ((multEF[y0] << 24) 
                     | (multEF[y0] << 16) 
@@ -213,6 +318,63 @@ void twofish_encrypt(TWOFISH_CTX *ctx, BYTE PT[16])
     ((u32*)PT)[0] = BSWAP(R2 ^ ctx->K[4]);
 }
 
+/* one encryption round over two interleaved blocks; the second block's
+   independent table lookups fill the latency of the first's */
+#define ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, round) \
+    T0 = fkh(R0); \
+    T1 = fkh(ROL(R1, 8)); \
+    U0 = fkh(S0); \
+    U1 = fkh(ROL(S1, 8)); \
+    R2 = ROR(R2 ^ (T1 + T0 + ctx->K[2*round+8]), 1); \
+    R3 = ROL(R3, 1) ^ (2*T1 + T0 + ctx->K[2*round+9]); \
+    S2 = ROR(S2 ^ (U1 + U0 + ctx->K[2*round+8]), 1); \
+    S3 = ROL(S3, 1) ^ (2*U1 + U0 + ctx->K[2*round+9]);
+
+/* encrypt two consecutive 16-byte blocks with interleaved round state */
+static void twofish_encrypt2(TWOFISH_CTX *ctx, BYTE *PT)
+{
+    u32 R0, R1, R2, R3;
+    u32 S0, S1, S2, S3;
+    u32 T0, T1, U0, U1;
+
+    /* load/byteswap/whiten input */
+    R3 = ctx->K[3] ^ BSWAP(((u32*)PT)[3]);
+    R2 = ctx->K[2] ^ BSWAP(((u32*)PT)[2]);
+    R1 = ctx->K[1] ^ BSWAP(((u32*)PT)[1]);
+    R0 = ctx->K[0] ^ BSWAP(((u32*)PT)[0]);
+    S3 = ctx->K[3] ^ BSWAP(((u32*)PT)[7]);
+    S2 = ctx->K[2] ^ BSWAP(((u32*)PT)[6]);
+    S1 = ctx->K[1] ^ BSWAP(((u32*)PT)[5]);
+    S0 = ctx->K[0] ^ BSWAP(((u32*)PT)[4]);
+
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 0);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 1);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 2);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 3);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 4);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 5);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 6);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 7);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 8);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 9);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 10);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 11);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 12);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 13);
+    ENC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 14);
+    ENC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 15);
+
+    /* load/byteswap/whiten output */
+    ((u32*)PT)[3] = BSWAP(R1 ^ ctx->K[7]);
+    ((u32*)PT)[2] = BSWAP(R0 ^ ctx->K[6]);
+    ((u32*)PT)[1] = BSWAP(R3 ^ ctx->K[5]);
+    ((u32*)PT)[0] = BSWAP(R2 ^ ctx->K[4]);
+    ((u32*)PT)[7] = BSWAP(S1 ^ ctx->K[7]);
+    ((u32*)PT)[6] = BSWAP(S0 ^ ctx->K[6]);
+    ((u32*)PT)[5] = BSWAP(S3 ^ ctx->K[5]);
+    ((u32*)PT)[4] = BSWAP(S2 ^ ctx->K[4]);
+}
+
 /* one decryption round */
 #define DEC_ROUND(R0, R1, R2, R3, round) \
     T0 = fkh(R0); \
@@ -255,6 +417,220 @@ void twofish_decrypt(TWOFISH_CTX *ctx, BYTE PT[16])
     ((u32*)PT)[0] = BSWAP(R2 ^ ctx->K[0]);
 }
 
+/* one decryption round over two interleaved blocks */
+#define DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, round) \
+    T0 = fkh(R0); \
+    T1 = fkh(ROL(R1, 8)); \
+    U0 = fkh(S0); \
+    U1 = fkh(ROL(S1, 8)); \
+    R2 = ROL(R2, 1) ^ (T0 + T1 + ctx->K[2*round+8]); \
+    R3 = ROR(R3 ^ (T0 + 2*T1 + ctx->K[2*round+9]), 1); \
+    S2 = ROL(S2, 1) ^ (U0 + U1 + ctx->K[2*round+8]); \
+    S3 = ROR(S3 ^ (U0 + 2*U1 + ctx->K[2*round+9]), 1);
+
+/* decrypt two consecutive 16-byte blocks with interleaved round state */
+static void twofish_decrypt2(TWOFISH_CTX *ctx, BYTE *PT)
+{
+    u32 R0, R1, R2, R3;
+    u32 S0, S1, S2, S3;
+    u32 T0, T1, U0, U1;
+
+    /* load/byteswap/whiten input */
+    R3 = ctx->K[7] ^ BSWAP(((u32*)PT)[3]);
+    R2 = ctx->K[6] ^ BSWAP(((u32*)PT)[2]);
+    R1 = ctx->K[5] ^ BSWAP(((u32*)PT)[1]);
+    R0 = ctx->K[4] ^ BSWAP(((u32*)PT)[0]);
+    S3 = ctx->K[7] ^ BSWAP(((u32*)PT)[7]);
+    S2 = ctx->K[6] ^ BSWAP(((u32*)PT)[6]);
+    S1 = ctx->K[5] ^ BSWAP(((u32*)PT)[5]);
+    S0 = ctx->K[4] ^ BSWAP(((u32*)PT)[4]);
+
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 15);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 14);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 13);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 12);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 11);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 10);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 9);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 8);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 7);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 6);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 5);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 4);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 3);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 2);
+    DEC_ROUND2(R0, R1, R2, R3, S0, S1, S2, S3, 1);
+    DEC_ROUND2(R2, R3, R0, R1, S2, S3, S0, S1, 0);
+
+    /* load/byteswap/whiten output */
+    ((u32*)PT)[3] = BSWAP(R1 ^ ctx->K[3]);
+    ((u32*)PT)[2] = BSWAP(R0 ^ ctx->K[2]);
+    ((u32*)PT)[1] = BSWAP(R3 ^ ctx->K[1]);
+    ((u32*)PT)[0] = BSWAP(R2 ^ ctx->K[0]);
+    ((u32*)PT)[7] = BSWAP(S1 ^ ctx->K[3]);
+    ((u32*)PT)[6] = BSWAP(S0 ^ ctx->K[2]);
+    ((u32*)PT)[5] = BSWAP(S3 ^ ctx->K[1]);
+    ((u32*)PT)[4] = BSWAP(S2 ^ ctx->K[0]);
+}
+
+/* encrypt a whole buffer of 16-byte blocks in place; keeps the data in C
+   across all blocks instead of paying a Python call per block */
+void twofish_ecb_encrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks)
+{
+    size_t i = 0;
+
+#ifdef _OPENMP
+    if (nblocks >= OMP_MIN_BLOCKS)
+    {
+        /* the context is read-only here, so threads can share it */
+        ptrdiff_t pair, npairs = nblocks / 2;
+
+        #pragma omp parallel for schedule(static)
+        for (pair = 0; pair < npairs; pair++)
+        {
+            twofish_encrypt2(ctx, buf + 32*pair);
+        }
+        i = (size_t)npairs * 2;
+        if (i < nblocks)
+        {
+            twofish_encrypt(ctx, buf + 16*i);
+        }
+        return;
+    }
+#endif
+    for (; i + 2 <= nblocks; i += 2)
+    {
+        twofish_encrypt2(ctx, buf + 16*i);
+    }
+    if (i < nblocks)
+    {
+        twofish_encrypt(ctx, buf + 16*i);
+    }
+}
+
+/* decrypt a whole buffer of 16-byte blocks in place */
+void twofish_ecb_decrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks)
+{
+    size_t i = 0;
+
+#ifdef _OPENMP
+    if (nblocks >= OMP_MIN_BLOCKS)
+    {
+        ptrdiff_t pair, npairs = nblocks / 2;
+
+        #pragma omp parallel for schedule(static)
+        for (pair = 0; pair < npairs; pair++)
+        {
+            twofish_decrypt2(ctx, buf + 32*pair);
+        }
+        i = (size_t)npairs * 2;
+        if (i < nblocks)
+        {
+            twofish_decrypt(ctx, buf + 16*i);
+        }
+        return;
+    }
+#endif
+    for (; i + 2 <= nblocks; i += 2)
+    {
+        twofish_decrypt2(ctx, buf + 16*i);
+    }
+    if (i < nblocks)
+    {
+        twofish_decrypt(ctx, buf + 16*i);
+    }
+}
+
+/* CBC encrypt a whole buffer of 16-byte blocks in place, chaining from iv */
+void twofish_cbc_encrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks, const BYTE iv[16])
+{
+    const BYTE *prev = iv;
+    size_t i;
+    int j;
+
+    for (i = 0; i < nblocks; i++)
+    {
+        BYTE *block = buf + 16*i;
+
+        for (j = 0; j < 16; j++)
+            block[j] ^= prev[j];
+        twofish_encrypt(ctx, block);
+        prev = block;
+    }
+}
+
+/* CBC decrypt a run of 16-byte blocks in place; each ciphertext block
+   is saved before decryption so the chain can continue. Unlike
+   encryption the blocks are independent, so pairs go through the
+   interleaved core */
+static void cbc_decrypt_run(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks, const BYTE iv[16])
+{
+    BYTE prev[16], saved[32];
+    size_t i = 0;
+    int j;
+
+    memcpy(prev, iv, 16);
+    for (; i + 2 <= nblocks; i += 2)
+    {
+        BYTE *block = buf + 16*i;
+
+        memcpy(saved, block, 32);
+        twofish_decrypt2(ctx, block);
+        for (j = 0; j < 16; j++)
+            block[j] ^= prev[j];
+        for (j = 0; j < 16; j++)
+            block[16 + j] ^= saved[j];
+        memcpy(prev, saved + 16, 16);
+    }
+    if (i < nblocks)
+    {
+        BYTE *block = buf + 16*i;
+
+        memcpy(saved, block, 16);
+        twofish_decrypt(ctx, block);
+        for (j = 0; j < 16; j++)
+            block[j] ^= prev[j];
+    }
+}
+
+/* CBC decrypt a whole buffer of 16-byte blocks in place */
+void twofish_cbc_decrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks, const BYTE iv[16])
+{
+#ifdef _OPENMP
+    if (nblocks >= OMP_MIN_BLOCKS)
+    {
+        size_t nchunks = (nblocks + OMP_CBC_CHUNK - 1) / OMP_CBC_CHUNK;
+        BYTE (*prevs)[16] = malloc(nchunks * 16);
+        ptrdiff_t c;
+
+        if (prevs != NULL)
+        {
+            /* every chunk chains only from the ciphertext block before
+               it, so save those blocks before any chunk is decrypted
+               in place */
+            memcpy(prevs[0], iv, 16);
+            for (c = 1; c < (ptrdiff_t)nchunks; c++)
+                memcpy(prevs[c], buf + 16*((size_t)c*OMP_CBC_CHUNK - 1), 16);
+
+            #pragma omp parallel for schedule(static)
+            for (c = 0; c < (ptrdiff_t)nchunks; c++)
+            {
+                size_t start = (size_t)c * OMP_CBC_CHUNK;
+                size_t count = nblocks - start;
+
+                if (count > OMP_CBC_CHUNK)
+                    count = OMP_CBC_CHUNK;
+                cbc_decrypt_run(ctx, buf + 16*start, count, prevs[c]);
+            }
+            free(prevs);
+            return;
+        }
+        /* save buffer unavailable: fall through to the serial path */
+    }
+#endif
+    cbc_decrypt_run(ctx, buf, nblocks, iv);
+}
+
 /* the key schedule routine */
 void twofish_set_key(TWOFISH_CTX *ctx, BYTE M[], int key_size)
 {
@@ -1,6 +1,8 @@
 #ifndef TWOFISH_H
 #define TWOFISH_H
 
+#include <stddef.h>
+
 #define u32 unsigned int
 #define BYTE unsigned char
 #ifndef BIG_ENDIAN
@@ -27,6 +29,18 @@ void twofish_encrypt(TWOFISH_CTX *ctx, BYTE PT[16]);
 /* Decrypt a block using Twofish */
 void twofish_decrypt(TWOFISH_CTX *ctx, BYTE PT[16]);
 
+/* Encrypt a buffer of consecutive 16-byte blocks in place (ECB) */
+void twofish_ecb_encrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks);
+
+/* Decrypt a buffer of consecutive 16-byte blocks in place (ECB) */
+void twofish_ecb_decrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks);
+
+/* Encrypt a buffer of consecutive 16-byte blocks in place (CBC) */
+void twofish_cbc_encrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks, const BYTE iv[16]);
+
+/* Decrypt a buffer of consecutive 16-byte blocks in place (CBC) */
+void twofish_cbc_decrypt(TWOFISH_CTX *ctx, BYTE *buf, size_t nblocks, const BYTE iv[16]);
+
 /* Free resources in a Twofish context */
 void twofish_free_ctx(TWOFISH_CTX *ctx);
 
@@ -111,11 +111,171 @@ Twofish_decrypt(TwofishObject *self, PyObject *args)
     return result;
 }
 
+static PyObject *
+Twofish_encrypt_blocks(TwofishObject *self, PyObject *args)
+{
+    Py_buffer data;
+    PyObject *result;
+    char *buffer;
+
+    if (!PyArg_ParseTuple(args, "y*", &data))
+        return NULL;
+
+    if (data.len % 16 != 0) {
+        PyErr_SetString(PyExc_ValueError, "Data length must be a multiple of 16 bytes");
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, data.len);
+    if (result == NULL) {
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    buffer = PyBytes_AS_STRING(result);
+    memcpy(buffer, data.buf, data.len);
+
+    Py_BEGIN_ALLOW_THREADS
+    twofish_ecb_encrypt(&self->ctx, (BYTE*)buffer, data.len / 16);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&data);
+    return result;
+}
+
+static PyObject *
+Twofish_decrypt_blocks(TwofishObject *self, PyObject *args)
+{
+    Py_buffer data;
+    PyObject *result;
+    char *buffer;
+
+    if (!PyArg_ParseTuple(args, "y*", &data))
+        return NULL;
+
+    if (data.len % 16 != 0) {
+        PyErr_SetString(PyExc_ValueError, "Data length must be a multiple of 16 bytes");
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, data.len);
+    if (result == NULL) {
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    buffer = PyBytes_AS_STRING(result);
+    memcpy(buffer, data.buf, data.len);
+
+    Py_BEGIN_ALLOW_THREADS
+    twofish_ecb_decrypt(&self->ctx, (BYTE*)buffer, data.len / 16);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&data);
+    return result;
+}
+
+static PyObject *
+Twofish_cbc_encrypt(TwofishObject *self, PyObject *args)
+{
+    Py_buffer data, iv;
+    PyObject *result;
+    char *buffer;
+
+    if (!PyArg_ParseTuple(args, "y*y*", &data, &iv))
+        return NULL;
+
+    if (data.len % 16 != 0) {
+        PyErr_SetString(PyExc_ValueError, "Data length must be a multiple of 16 bytes");
+        PyBuffer_Release(&data);
+        PyBuffer_Release(&iv);
+        return NULL;
+    }
+
+    if (iv.len != 16) {
+        PyErr_SetString(PyExc_ValueError, "IV must be exactly 16 bytes");
+        PyBuffer_Release(&data);
+        PyBuffer_Release(&iv);
+        return NULL;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, data.len);
+    if (result == NULL) {
+        PyBuffer_Release(&data);
+        PyBuffer_Release(&iv);
+        return NULL;
+    }
+
+    buffer = PyBytes_AS_STRING(result);
+    memcpy(buffer, data.buf, data.len);
+
+    Py_BEGIN_ALLOW_THREADS
+    twofish_cbc_encrypt(&self->ctx, (BYTE*)buffer, data.len / 16, (const BYTE*)iv.buf);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&data);
+    PyBuffer_Release(&iv);
+    return result;
+}
+
+static PyObject *
+Twofish_cbc_decrypt(TwofishObject *self, PyObject *args)
+{
+    Py_buffer data, iv;
+    PyObject *result;
+    char *buffer;
+
+    if (!PyArg_ParseTuple(args, "y*y*", &data, &iv))
+        return NULL;
+
+    if (data.len % 16 != 0) {
+        PyErr_SetString(PyExc_ValueError, "Data length must be a multiple of 16 bytes");
+        PyBuffer_Release(&data);
+        PyBuffer_Release(&iv);
+        return NULL;
+    }
+
+    if (iv.len != 16) {
+        PyErr_SetString(PyExc_ValueError, "IV must be exactly 16 bytes");
+        PyBuffer_Release(&data);
+        PyBuffer_Release(&iv);
+        return NULL;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, data.len);
+    if (result == NULL) {
+        PyBuffer_Release(&data);
+        PyBuffer_Release(&iv);
+        return NULL;
+    }
+
+    buffer = PyBytes_AS_STRING(result);
+    memcpy(buffer, data.buf, data.len);
+
+    Py_BEGIN_ALLOW_THREADS
+    twofish_cbc_decrypt(&self->ctx, (BYTE*)buffer, data.len / 16, (const BYTE*)iv.buf);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&data);
+    PyBuffer_Release(&iv);
+    return result;
+}
+
 static PyMethodDef Twofish_methods[] = {
     {"encrypt", (PyCFunction)Twofish_encrypt, METH_VARARGS,
      "Encrypt a 16-byte block with Twofish"},
     {"decrypt", (PyCFunction)Twofish_decrypt, METH_VARARGS,
      "Decrypt a 16-byte block with Twofish"},
+    {"encrypt_blocks", (PyCFunction)Twofish_encrypt_blocks, METH_VARARGS,
+     "Encrypt a buffer of consecutive 16-byte blocks with Twofish (ECB)"},
+    {"decrypt_blocks", (PyCFunction)Twofish_decrypt_blocks, METH_VARARGS,
+     "Decrypt a buffer of consecutive 16-byte blocks with Twofish (ECB)"},
+    {"cbc_encrypt", (PyCFunction)Twofish_cbc_encrypt, METH_VARARGS,
+     "Encrypt a buffer of consecutive 16-byte blocks with Twofish (CBC)"},
+    {"cbc_decrypt", (PyCFunction)Twofish_cbc_decrypt, METH_VARARGS,
+     "Decrypt a buffer of consecutive 16-byte blocks with Twofish (CBC)"},
     {NULL}  /* Sentinel */
 };
 